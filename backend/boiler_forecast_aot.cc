@@ -0,0 +1,45 @@
+// C entry points for the XLA AOT-compiled forecast (boiler_forecast_aot.so).
+//
+// Built by `python export_model.py aot`, which generates boiler_forecast.h
+// with saved_model_cli aot_compile_cpu; main.py calls these through ctypes
+// (INFERENCE_RUNTIME=aot).
+#include <cstring>
+
+#include "boiler_forecast.h"
+
+namespace {
+
+// One instance per thread: it owns preallocated temp buffers, and Run()
+// isn't reentrant. ctypes drops the GIL, so worker threads run in parallel.
+BoilerForecast& thread_computation() {
+  thread_local BoilerForecast computation;
+  return computation;
+}
+
+}  // namespace
+
+extern "C" {
+
+// Number of forecast steps the computation was compiled for.
+int boiler_forecast_steps() {
+  return thread_computation().result_size(0) / sizeof(float);
+}
+
+// Run the full forecast for one window.
+//   sequence:     (1, 60, 4) float32, normalized
+//   controls:     (1, 3) float32, normalized [valve, pressure, flow]
+//   temperatures: (1, steps) float32 output, normalized
+// Returns 0 on success.
+int boiler_forecast(const float* sequence, const float* controls, float* temperatures) {
+  BoilerForecast& computation = thread_computation();
+  computation.set_arg_feed_sequence_data(sequence);
+  computation.set_arg_feed_controls_data(controls);
+  if (!computation.Run()) {
+    return 1;
+  }
+
+  std::memcpy(temperatures, computation.result0_data(), computation.result_size(0));
+  return 0;
+}
+
+}  // extern "C"
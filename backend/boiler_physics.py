@@ -15,8 +15,287 @@ Key Variables:
 - fire_intensity: 0-100% (coal firing rate)
 """
 
+import sys
 import time
-from typing import Dict, Optional
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from numba import njit
+
+
+# ========================
+# Physical Constants
+# ========================
+# Module-level so the compiled kernel below can fold them in as constants.
+# DrumBoilerPhysics re-exports them as class attributes.
+
+# Mass balance constants
+FEEDWATER_INFLOW = 15.0  # Constant pump rate (units/sec)
+STEAM_CONVERSION_FACTOR = 0.5  # Fire -> Steam efficiency
+
+# Energy balance constants
+PRESSURE_BUILD_RATE = 1.0  # How fast pressure rises
+PRESSURE_DECAY_RATE = 0.1  # Natural pressure loss (steam to turbine)
+
+# Safety limits
+MAX_PRESSURE = 25.0  # MPa (Critical pressure)
+MIN_WATER_LEVEL = 10.0  # % (Low level trip)
+MAX_WATER_LEVEL = 90.0  # % (High level trip)
+CRITICAL_PRESSURE_THRESHOLD = 20.0  # MPa (Warning threshold)
+WARNING_WATER_LEVEL = 20.0  # % (Low level warning)
+WARNING_PRESSURE = 18.0  # MPa (High pressure warning)
+
+# Simulation timing
+UPDATE_INTERVAL = 0.1  # 100ms per physics tick
+FIXED_DT_TOLERANCE = 0.01  # s; ticks within this of UPDATE_INTERVAL use the fixed-step kernel
+HISTORY_LENGTH = 1000  # Samples kept in the DrumBoilerPhysics history ring buffer
+
+# Columns of the numeric history buffer (see DrumBoilerPhysics.get_history)
+HISTORY_FIELDS = ("water_level", "pressure", "temperature", "fire_intensity", "steam_generation")
+
+# ========================
+# Status Codes
+# ========================
+# The kernel returns an int; STATUS_NAMES maps it back to the API string.
+
+STATUS_NORMAL = 0
+STATUS_WARNING = 1
+STATUS_CRITICAL_PRESSURE = 2
+STATUS_LOW_LEVEL_TRIP = 3
+STATUS_HIGH_LEVEL_TRIP = 4
+
+STATUS_NAMES = (
+    "NORMAL",
+    "WARNING",
+    "CRITICAL_PRESSURE",
+    "LOW_LEVEL_TRIP",
+    "HIGH_LEVEL_TRIP",
+)
+
+# Threshold crossings packed into a 5-bit mask; _STATUS_TABLE[mask] gives the
+# status code, encoding the precedence CRITICAL > LOW TRIP > HIGH TRIP > WARNING
+_BIT_CRITICAL_PRESSURE = 1 << 0  # pressure > CRITICAL_PRESSURE_THRESHOLD
+_BIT_LOW_LEVEL_TRIP = 1 << 1     # water_level < MIN_WATER_LEVEL
+_BIT_HIGH_LEVEL_TRIP = 1 << 2    # water_level > MAX_WATER_LEVEL
+_BIT_LOW_LEVEL_WARNING = 1 << 3  # water_level < WARNING_WATER_LEVEL
+_BIT_HIGH_PRESSURE_WARNING = 1 << 4  # pressure > WARNING_PRESSURE
+
+
+def _build_status_table() -> np.ndarray:
+    """Precompute the status code for every threshold-crossing mask"""
+    table = np.empty(32, dtype=np.uint8)
+    for mask in range(32):
+        if mask & _BIT_CRITICAL_PRESSURE:
+            table[mask] = STATUS_CRITICAL_PRESSURE
+        elif mask & _BIT_LOW_LEVEL_TRIP:
+            table[mask] = STATUS_LOW_LEVEL_TRIP
+        elif mask & _BIT_HIGH_LEVEL_TRIP:
+            table[mask] = STATUS_HIGH_LEVEL_TRIP
+        elif mask & (_BIT_LOW_LEVEL_WARNING | _BIT_HIGH_PRESSURE_WARNING):
+            table[mask] = STATUS_WARNING
+        else:
+            table[mask] = STATUS_NORMAL
+    return table
+
+
+_STATUS_TABLE = _build_status_table()
+
+
+# ========================
+# Compiled Physics Kernel
+# ========================
+
+@njit(inline="always")
+def _advance(water_level, pressure, fire_intensity, steps):
+    """
+    One physics step (steps 1-4 and the safety classification of step 5)
+
+    Args:
+        water_level: Current drum level (0-100%)
+        pressure: Current steam pressure (MPa)
+        fire_intensity: Clamped fire setting (0-100%)
+        steps: Elapsed time in nominal ticks (dt / UPDATE_INTERVAL)
+
+    Returns:
+        (water_level, pressure, temperature, steam_generation_rate, status_code)
+    """
+    # STEP 1: STEAM GENERATION
+    steam_generation_rate = fire_intensity * STEAM_CONVERSION_FACTOR
+
+    # STEP 2: MASS BALANCE (Water Level)
+    net_water_change = (FEEDWATER_INFLOW - steam_generation_rate) * steps
+    water_level = max(0.0, min(100.0, water_level + net_water_change))
+
+    # STEP 3: ENERGY BALANCE (Pressure)
+    pressure_build = steam_generation_rate * PRESSURE_BUILD_RATE * steps
+    pressure_loss = pressure * PRESSURE_DECAY_RATE * steps
+    pressure = max(0.0, min(MAX_PRESSURE, pressure + pressure_build - pressure_loss))
+
+    # STEP 4: TEMPERATURE ESTIMATE
+    # Base temperature from pressure (saturation curve approximation)
+    temperature = 540.0 + (pressure / MAX_PRESSURE) * 60.0  # 540-600°C range
+
+    # Superheat correction (low water causes temperature spike)
+    if water_level < 30.0:
+        temperature += (30.0 - water_level) * 2.0  # Up to +60°C if dry
+
+    # STEP 5: SAFETY CLASSIFICATION (branchless table lookup)
+    mask = (
+        int(pressure > CRITICAL_PRESSURE_THRESHOLD) * _BIT_CRITICAL_PRESSURE
+        | int(water_level < MIN_WATER_LEVEL) * _BIT_LOW_LEVEL_TRIP
+        | int(water_level > MAX_WATER_LEVEL) * _BIT_HIGH_LEVEL_TRIP
+        | int(water_level < WARNING_WATER_LEVEL) * _BIT_LOW_LEVEL_WARNING
+        | int(pressure > WARNING_PRESSURE) * _BIT_HIGH_PRESSURE_WARNING
+    )
+    status = np.int64(_STATUS_TABLE[mask])
+
+    return water_level, pressure, temperature, steam_generation_rate, status
+
+
+@njit(
+    "Tuple((float64, float64, float64, float64, int64))(float64, float64, float64, float64)",
+    cache=True,
+    fastmath=True,
+)
+def _tick(water_level, pressure, fire_intensity, dt):
+    """Variable-step tick: scales every rate by dt / UPDATE_INTERVAL"""
+    return _advance(water_level, pressure, fire_intensity, dt / UPDATE_INTERVAL)
+
+
+@njit(
+    "Tuple((float64, float64, float64, float64, int64))(float64, float64, float64)",
+    cache=True,
+    fastmath=True,
+)
+def _tick_fixed(water_level, pressure, fire_intensity):
+    """Fixed-step tick (dt == UPDATE_INTERVAL): rate scaling folds away"""
+    return _advance(water_level, pressure, fire_intensity, 1.0)
+
+
+# Shared alarm list for NORMAL ticks (the common case): no allocation
+_NO_ALARMS = ()
+
+
+def _alarm_messages(status_code: int, water_level: float, pressure: float) -> Tuple[str, ...]:
+    """
+    Get the operator alarm strings for a classified state
+    
+    Args:
+        status_code: Status code returned by the physics kernel
+        water_level: Drum level after the tick (%)
+        pressure: Steam pressure after the tick (MPa)
+        
+    Returns:
+        Tuple of alarm messages (empty when NORMAL)
+    """
+    if status_code == STATUS_NORMAL:
+        return _NO_ALARMS
+        
+    # Messages show one decimal, so states that agree to 0.1 share strings.
+    # Warning thresholds are tested on the exact values before rounding.
+    return _format_alarms(
+        status_code,
+        water_level < WARNING_WATER_LEVEL,
+        pressure > WARNING_PRESSURE,
+        round(water_level, 1),
+        round(pressure, 1)
+    )
+
+
+@lru_cache(maxsize=256)
+def _format_alarms(
+    status_code: int,
+    low_level: bool,
+    high_pressure: bool,
+    water_level: float,
+    pressure: float
+) -> Tuple[str, ...]:
+    """Format the alarm strings for a non-NORMAL state (cached)"""
+    alarms = []
+    
+    if status_code == STATUS_CRITICAL_PRESSURE:
+        alarms.append(f"⚠️ CRITICAL: Pressure {pressure:.1f} MPa exceeds safe limit!")
+        
+    elif status_code == STATUS_LOW_LEVEL_TRIP:
+        alarms.append(f"🚨 TRIP: Drum level {water_level:.1f}% - Boiler shutdown!")
+        
+    elif status_code == STATUS_HIGH_LEVEL_TRIP:
+        alarms.append(f"🚨 TRIP: Drum level {water_level:.1f}% - Carryover risk!")
+        
+    elif status_code == STATUS_WARNING:
+        if low_level:
+            alarms.append(f"⚠️ WARNING: Low drum level {water_level:.1f}%")
+        if high_pressure:
+            alarms.append(f"⚠️ WARNING: High pressure {pressure:.1f} MPa")
+            
+    return tuple(alarms)
+
+
+def simulate_constant_fire(
+    fire_intensity: float,
+    ticks: int,
+    water_level: float = 50.0,
+    pressure: float = 10.0,
+    dt: float = UPDATE_INTERVAL
+) -> Dict[str, np.ndarray]:
+    """
+    Closed-form trajectory for a run at constant fire
+    
+    With fire held constant, the mass balance is linear in time and the
+    energy balance is the first-order recurrence
+        P[n+1] = P[n] * r + build,   r = 1 - DECAY * dt / UPDATE_INTERVAL
+    which solves to P[n] = P_inf + (P0 - P_inf) * r**n. Both trajectories
+    are monotonic, so clipping the closed form reproduces the per-tick clamps.
+    
+    Args:
+        fire_intensity: Fire setting held for the whole run (0-100%)
+        ticks: Number of physics ticks to simulate
+        water_level: Starting water level (0-100%)
+        pressure: Starting pressure (MPa)
+        dt: Seconds per tick
+        
+    Returns:
+        Dict of arrays indexed by tick (state after tick n+1):
+        {water_level, pressure, temperature, steam_generation, status}
+    """
+    fire_intensity = max(0.0, min(100.0, fire_intensity))
+    steps = dt / UPDATE_INTERVAL
+    n = np.arange(1, ticks + 1, dtype=np.float64)
+    
+    # Mass balance: linear ramp
+    steam_generation_rate = fire_intensity * STEAM_CONVERSION_FACTOR
+    net_water_change = (FEEDWATER_INFLOW - steam_generation_rate) * steps
+    water = np.clip(water_level + net_water_change * n, 0.0, 100.0)
+    
+    # Energy balance: geometric approach to equilibrium
+    build = steam_generation_rate * PRESSURE_BUILD_RATE * steps
+    decay = PRESSURE_DECAY_RATE * steps
+    r = 1.0 - decay
+    p_inf = build / decay
+    press = np.clip(p_inf + (pressure - p_inf) * np.power(r, n), 0.0, MAX_PRESSURE)
+    
+    # Temperature: saturation curve plus low-level superheat
+    temp = 540.0 + (press / MAX_PRESSURE) * 60.0
+    temp += np.where(water < 30.0, (30.0 - water) * 2.0, 0.0)
+    
+    # Safety classification (same mask and table as the kernel)
+    mask = (
+        (press > CRITICAL_PRESSURE_THRESHOLD) * _BIT_CRITICAL_PRESSURE
+        | (water < MIN_WATER_LEVEL) * _BIT_LOW_LEVEL_TRIP
+        | (water > MAX_WATER_LEVEL) * _BIT_HIGH_LEVEL_TRIP
+        | (water < WARNING_WATER_LEVEL) * _BIT_LOW_LEVEL_WARNING
+        | (press > WARNING_PRESSURE) * _BIT_HIGH_PRESSURE_WARNING
+    )
+    status = _STATUS_TABLE[mask]
+    
+    return {
+        "water_level": water,
+        "pressure": press,
+        "temperature": temp,
+        "steam_generation": np.full(ticks, steam_generation_rate),
+        "status": status,
+    }
 
 
 class DrumBoilerPhysics:
@@ -34,21 +313,21 @@ class DrumBoilerPhysics:
     # ========================
     
     # Mass balance constants
-    FEEDWATER_INFLOW = 15.0  # Constant pump rate (units/sec)
-    STEAM_CONVERSION_FACTOR = 0.5  # Fire -> Steam efficiency
+    FEEDWATER_INFLOW = FEEDWATER_INFLOW
+    STEAM_CONVERSION_FACTOR = STEAM_CONVERSION_FACTOR
     
     # Energy balance constants
-    PRESSURE_BUILD_RATE = 1.0  # How fast pressure rises
-    PRESSURE_DECAY_RATE = 0.1  # Natural pressure loss (steam to turbine)
+    PRESSURE_BUILD_RATE = PRESSURE_BUILD_RATE
+    PRESSURE_DECAY_RATE = PRESSURE_DECAY_RATE
     
     # Safety limits
-    MAX_PRESSURE = 25.0  # MPa (Critical pressure)
-    MIN_WATER_LEVEL = 10.0  # % (Low level trip)
-    MAX_WATER_LEVEL = 90.0  # % (High level trip)
-    CRITICAL_PRESSURE_THRESHOLD = 20.0  # MPa (Warning threshold)
+    MAX_PRESSURE = MAX_PRESSURE
+    MIN_WATER_LEVEL = MIN_WATER_LEVEL
+    MAX_WATER_LEVEL = MAX_WATER_LEVEL
+    CRITICAL_PRESSURE_THRESHOLD = CRITICAL_PRESSURE_THRESHOLD
     
     # Simulation timing
-    UPDATE_INTERVAL = 0.1  # 100ms per physics tick
+    UPDATE_INTERVAL = UPDATE_INTERVAL
     
     def __init__(
         self,
@@ -72,18 +351,24 @@ class DrumBoilerPhysics:
         
         # Status tracking
         self.status = "NORMAL"  # NORMAL, WARNING, CRITICAL, TRIPPED
-        self.alarm_messages = []
-        self.last_update_time = time.time()
+        self.status_code = STATUS_NORMAL  # Integer form of status (index into STATUS_NAMES)
+        self.alarm_messages = _NO_ALARMS
+        self._last_ns = time.monotonic_ns()  # Monotonic clock: dt can't go negative
         
-        # History (for debugging/analysis)
-        self.history = []
+        # History (for debugging/analysis): ring buffer of the last
+        # HISTORY_LENGTH ticks, one float32 row per tick plus a status code
+        self._hist_buf = np.empty((HISTORY_LENGTH, len(HISTORY_FIELDS)), dtype=np.float32)
+        self._hist_status = np.empty(HISTORY_LENGTH, dtype=np.uint8)
+        self._hist_head = 0
+        self._hist_count = 0
         
-    def update(self, fire_intensity: float) -> Dict:
+    def update(self, fire_intensity: float, dt: Optional[float] = None) -> Dict:
         """
         Run one physics simulation step
         
         Args:
             fire_intensity: User input for fire (0-100%)
+            dt: Override the wall-clock time delta (seconds); used by the self-test
             
         Returns:
             Dict containing current state {water_level, pressure, temperature, status}
@@ -94,90 +379,36 @@ class DrumBoilerPhysics:
         self.fire_intensity = max(0.0, min(100.0, fire_intensity))
         
         # Calculate time delta (for variable frame rates)
-        current_time = time.time()
-        dt = current_time - self.last_update_time
-        self.last_update_time = current_time
+        now_ns = time.monotonic_ns()
+        if dt is None:
+            dt = (now_ns - self._last_ns) * 1e-9
+        self._last_ns = now_ns
         
         # ========================
-        # STEP 1: STEAM GENERATION
-        # ========================
-        # High fire = more water turns to steam
-        steam_generation_rate = self.fire_intensity * self.STEAM_CONVERSION_FACTOR
-        
+        # STEPS 1-5: COMPILED PHYSICS KERNEL
         # ========================
-        # STEP 2: MASS BALANCE (Water Level)
-        # ========================
-        # Water IN (constant pump)
-        water_inflow = self.FEEDWATER_INFLOW
-        
-        # Water OUT (evaporation from fire)
-        water_outflow = steam_generation_rate
-        
-        # Net change
-        net_water_change = (water_inflow - water_outflow) * dt / self.UPDATE_INTERVAL
-        self.water_level += net_water_change
-        
-        # Clamp to physical limits (can't have negative water or overflow)
-        self.water_level = max(0.0, min(100.0, self.water_level))
-        
-        # ========================
-        # STEP 3: ENERGY BALANCE (Pressure)
-        # ========================
-        # Pressure increases from steam generation
-        pressure_build = steam_generation_rate * self.PRESSURE_BUILD_RATE * dt / self.UPDATE_INTERVAL
-        
-        # Pressure decreases from steam extraction (turbine demand)
-        pressure_loss = self.pressure * self.PRESSURE_DECAY_RATE * dt / self.UPDATE_INTERVAL
-        
-        # Net change
-        net_pressure_change = pressure_build - pressure_loss
-        self.pressure += net_pressure_change
+        # At the nominal 10 Hz cadence dt/UPDATE_INTERVAL is ~1, so use the
+        # kernel specialized for exactly one tick
+        if abs(dt - UPDATE_INTERVAL) <= FIXED_DT_TOLERANCE:
+            result = _tick_fixed(self.water_level, self.pressure, self.fire_intensity)
+        else:
+            result = _tick(self.water_level, self.pressure, self.fire_intensity, dt)
+            
+        (
+            self.water_level,
+            self.pressure,
+            self.temperature,
+            steam_generation_rate,
+            status_code,
+        ) = result
         
-        # Clamp to physical limits
-        self.pressure = max(0.0, min(self.MAX_PRESSURE, self.pressure))
+        self.status_code = status_code
+        self.status = STATUS_NAMES[status_code]
         
         # ========================
-        # STEP 4: TEMPERATURE ESTIMATE
+        # ALARM MESSAGES
         # ========================
-        # Temperature correlates with pressure and water level
-        # Low water = superheating = high temp
-        # High pressure = high saturation temp
-        
-        # Base temperature from pressure (saturation curve approximation)
-        base_temp = 540 + (self.pressure / self.MAX_PRESSURE) * 60  # 540-600°C range
-        
-        # Superheat correction (low water causes temperature spike)
-        if self.water_level < 30.0:
-            superheat = (30.0 - self.water_level) * 2.0  # Up to +60°C if dry
-            self.temperature = base_temp + superheat
-        else:
-            self.temperature = base_temp
-            
-        # ========================
-        # STEP 5: SAFETY CHECKS
-        # ========================
-        self.alarm_messages = []
-        
-        if self.pressure > self.CRITICAL_PRESSURE_THRESHOLD:
-            self.status = "CRITICAL_PRESSURE"
-            self.alarm_messages.append(f"⚠️ CRITICAL: Pressure {self.pressure:.1f} MPa exceeds safe limit!")
-            
-        elif self.water_level < self.MIN_WATER_LEVEL:
-            self.status = "LOW_LEVEL_TRIP"
-            self.alarm_messages.append(f"🚨 TRIP: Drum level {self.water_level:.1f}% - Boiler shutdown!")
-            
-        elif self.water_level > self.MAX_WATER_LEVEL:
-            self.status = "HIGH_LEVEL_TRIP"
-            self.alarm_messages.append(f"🚨 TRIP: Drum level {self.water_level:.1f}% - Carryover risk!")
-            
-        elif self.water_level < 20.0 or self.pressure > 18.0:
-            self.status = "WARNING"
-            if self.water_level < 20.0:
-                self.alarm_messages.append(f"⚠️ WARNING: Low drum level {self.water_level:.1f}%")
-            if self.pressure > 18.0:
-                self.alarm_messages.append(f"⚠️ WARNING: High pressure {self.pressure:.1f} MPa")
-        else:
-            self.status = "NORMAL"
+        self.alarm_messages = _alarm_messages(status_code, self.water_level, self.pressure)
         
         # ========================
         # STEP 6: RETURN STATE
@@ -192,11 +423,19 @@ class DrumBoilerPhysics:
             "alarms": self.alarm_messages
         }
         
-        # Store in history
-        self.history.append(state.copy())
-        if len(self.history) > 1000:  # Keep last 1000 samples
-            self.history.pop(0)
-            
+        # Store in history (overwrites the oldest row once full)
+        head = self._hist_head
+        self._hist_buf[head] = (
+            self.water_level,
+            self.pressure,
+            self.temperature,
+            self.fire_intensity,
+            steam_generation_rate,
+        )
+        self._hist_status[head] = status_code
+        self._hist_head = (head + 1) % HISTORY_LENGTH
+        self._hist_count = min(self._hist_count + 1, HISTORY_LENGTH)
+        
         return state
     
     def reset(
@@ -218,9 +457,33 @@ class DrumBoilerPhysics:
         self.temperature = temperature
         self.fire_intensity = 0.0
         self.status = "NORMAL"
-        self.alarm_messages = []
-        self.history = []
-        self.last_update_time = time.time()
+        self.status_code = STATUS_NORMAL
+        self.alarm_messages = _NO_ALARMS
+        self._hist_head = 0
+        self._hist_count = 0
+        self._last_ns = time.monotonic_ns()
+        
+    def get_history(self) -> Dict[str, np.ndarray]:
+        """
+        Get the recorded history, oldest sample first
+        
+        Returns:
+            Dict of arrays, one per HISTORY_FIELDS column plus "status"
+            (status codes; map with STATUS_NAMES)
+        """
+        # Unwrap the ring at the head pointer with two slices (one copy),
+        # rather than gathering through a rolled index array
+        head = self._hist_head
+        if self._hist_count < HISTORY_LENGTH:
+            rows = self._hist_buf[:head].copy()
+            status = self._hist_status[:head].copy()
+        else:
+            rows = np.concatenate((self._hist_buf[head:], self._hist_buf[:head]))
+            status = np.concatenate((self._hist_status[head:], self._hist_status[:head]))
+            
+        history = {field: rows[:, i] for i, field in enumerate(HISTORY_FIELDS)}
+        history["status"] = status
+        return history
         
     def get_state(self) -> Dict:
         """
@@ -246,10 +509,57 @@ class DrumBoilerPhysics:
 if __name__ == "__main__":
     """
     Test the physics engine standalone
-    Run: python boiler_physics.py
+    Run: python boiler_physics.py [--scalar]
+    
+    By default each constant-fire run is evaluated in closed form with
+    simulate_constant_fire(); --scalar steps DrumBoilerPhysics.update()
+    tick by tick instead (useful when debugging the kernel itself).
     """
+    TRIP_STATES = ["LOW_LEVEL_TRIP", "HIGH_LEVEL_TRIP", "CRITICAL_PRESSURE"]
+    scalar_mode = "--scalar" in sys.argv[1:]
+    
+    def run_scalar(boiler, fire_intensity, ticks, stop_on_trip):
+        for i in range(ticks):
+            state = boiler.update(fire_intensity=fire_intensity, dt=UPDATE_INTERVAL)
+            
+            if i % 20 == 0:  # Print every 2 seconds
+                print(f"t={i*0.1:.1f}s | Water: {state['water_level']:.1f}% | "
+                      f"Pressure: {state['pressure']:.1f} MPa | "
+                      f"Status: {state['status']}")
+                
+            if stop_on_trip and state['status'] in TRIP_STATES:
+                print(f"\n❌ TRIPPED at t={i*0.1:.1f}s")
+                for alarm in state['alarms']:
+                    print(f"   {alarm}")
+                break
+    
+    def run_vectorized(boiler, fire_intensity, ticks, stop_on_trip):
+        run = simulate_constant_fire(
+            fire_intensity, ticks,
+            water_level=boiler.water_level,
+            pressure=boiler.pressure
+        )
+        status = run["status"]
+        
+        # First tick that enters a trip state (if any)
+        trip_codes = [STATUS_LOW_LEVEL_TRIP, STATUS_HIGH_LEVEL_TRIP, STATUS_CRITICAL_PRESSURE]
+        tripped = np.flatnonzero(np.isin(status, trip_codes)) if stop_on_trip else []
+        last = tripped[0] if len(tripped) else ticks - 1
+        
+        for i in range(0, last + 1, 20):  # Print every 2 seconds
+            print(f"t={i*0.1:.1f}s | Water: {run['water_level'][i]:.1f}% | "
+                  f"Pressure: {run['pressure'][i]:.1f} MPa | "
+                  f"Status: {STATUS_NAMES[status[i]]}")
+            
+        if len(tripped):
+            print(f"\n❌ TRIPPED at t={last*0.1:.1f}s")
+            for alarm in _alarm_messages(status[last], run['water_level'][last], run['pressure'][last]):
+                print(f"   {alarm}")
+    
+    run = run_scalar if scalar_mode else run_vectorized
+    
     print("="*60)
-    print("DRUM BOILER PHYSICS ENGINE - TEST MODE")
+    print(f"DRUM BOILER PHYSICS ENGINE - TEST MODE ({'scalar' if scalar_mode else 'vectorized'})")
     print("="*60)
     
     boiler = DrumBoilerPhysics()
@@ -258,19 +568,7 @@ if __name__ == "__main__":
     print("\n🔥 Test 1: Fire at 100% (should crash from low water)")
     print("-"*60)
     
-    for i in range(200):  # 200 ticks = 20 seconds
-        state = boiler.update(fire_intensity=100.0)
-        
-        if i % 20 == 0:  # Print every 2 seconds
-            print(f"t={i*0.1:.1f}s | Water: {state['water_level']:.1f}% | "
-                  f"Pressure: {state['pressure']:.1f} MPa | "
-                  f"Status: {state['status']}")
-            
-        if state['status'] in ["LOW_LEVEL_TRIP", "HIGH_LEVEL_TRIP", "CRITICAL_PRESSURE"]:
-            print(f"\n❌ TRIPPED at t={i*0.1:.1f}s")
-            for alarm in state['alarms']:
-                print(f"   {alarm}")
-            break
+    run(boiler, 100.0, 200, stop_on_trip=True)  # 200 ticks = 20 seconds
     
     # Reset and test equilibrium
     print("\n\n🔥 Test 2: Fire at 30% (equilibrium point)")
@@ -278,12 +576,6 @@ if __name__ == "__main__":
     
     boiler.reset()
     
-    for i in range(100):
-        state = boiler.update(fire_intensity=30.0)
-        
-        if i % 20 == 0:
-            print(f"t={i*0.1:.1f}s | Water: {state['water_level']:.1f}% | "
-                  f"Pressure: {state['pressure']:.1f} MPa | "
-                  f"Status: {state['status']}")
+    run(boiler, 30.0, 100, stop_on_trip=False)
     
     print("\n✅ Physics engine test complete!")
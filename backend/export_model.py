@@ -0,0 +1,494 @@
+"""
+Model Export
+============
+
+Converts the trained Keras LSTM (boiler_model.keras) into compiled
+inference formats that main.py can serve without Keras' per-layer Python
+dispatch.
+
+USAGE:
+    python export_model.py              # all formats
+    python export_model.py int8         # just the listed formats
+
+FORMATS:
+    scaler  -> scaler.npz                (normalization used by the server)
+    tflite  -> boiler_model.tflite       (INFERENCE_RUNTIME=tflite)
+    int8    -> boiler_model_int8.tflite  (INFERENCE_RUNTIME=tflite_int8)
+    fp16    -> boiler_model_fp16.tflite  (INFERENCE_RUNTIME=tflite_fp16)
+    numpy   -> lstm_weights.npz          (INFERENCE_RUNTIME=numpy)
+    onnx    -> boiler_model.onnx         (INFERENCE_RUNTIME=onnx, needs onnx)
+    aot     -> boiler_forecast_aot.so    (INFERENCE_RUNTIME=aot, needs g++, cmake, make)
+
+Re-run this script whenever train_model.ipynb produces a new model.
+"""
+
+import argparse
+import csv
+import os
+import pickle
+import subprocess
+import tempfile
+import numpy as np
+import tensorflow as tf
+from tensorflow import keras
+from tensorflow.python.framework.convert_to_constants import convert_variables_to_constants_v2
+
+MODEL_PATH = "boiler_model.keras"
+SCALER_PATH = "scaler.pkl"
+SCALER_NPZ_PATH = "scaler.npz"
+DATA_PATH = "data.csv"
+TFLITE_PATH = "boiler_model.tflite"
+TFLITE_INT8_PATH = "boiler_model_int8.tflite"
+TFLITE_FP16_PATH = "boiler_model_fp16.tflite"
+WEIGHTS_PATH = "lstm_weights.npz"
+ONNX_PATH = "boiler_model.onnx"
+AOT_LIBRARY_PATH = "boiler_forecast_aot.so"
+AOT_WRAPPER_PATH = "boiler_forecast_aot.cc"  # C entry points around the compiled class
+AOT_TARGET_CPU = "haswell"  # AVX2/FMA; "" targets any x86-64 but runs ~1.7x slower
+SEQUENCE_LENGTH = 60  # Must match training
+FORECAST_STEPS = 30   # Must match main.py
+N_FEATURES = 4        # [valve, pressure, flow, temperature]
+
+# data.csv columns used for training, in feature order (see train_model.ipynb)
+FEATURE_COLUMNS = ['TV_8329ZC.AV_0#', 'PT_8313A.AV_0#', 'FT_8301.AV_0#', 'TE_8332A.AV_0#']
+CHECK_SAMPLES = 20  # Training windows the quantized exports are checked against
+
+def scaler_affine(scaler_path: str = SCALER_PATH):
+    """
+    Reduce the pickled sklearn scaler to its affine x_norm = x * scale + min.
+
+    Handles the MinMaxScaler from train_model.ipynb as well as the
+    StandardScaler written by fix_scaler.py.
+
+    Returns:
+        (scale, min) float64 arrays of shape (4,)
+    """
+    with open(scaler_path, 'rb') as f:
+        scaler = pickle.load(f)
+
+    if hasattr(scaler, "min_"):
+        return scaler.scale_, scaler.min_
+    return 1.0 / scaler.scale_, -scaler.mean_ / scaler.scale_
+
+def export_scaler(scaler_path: str = SCALER_PATH, output_path: str = SCALER_NPZ_PATH):
+    """
+    Save the scaler as plain NumPy arrays (scale, min) for the server.
+
+    main.py normalizes with x * scale + min and denormalizes with
+    (y - min) / scale, so it never needs sklearn or pickle at runtime.
+    """
+    print(f"Loading scaler from {scaler_path}...")
+    scale, min_ = scaler_affine(scaler_path)
+    np.savez(output_path, scale=scale, min=min_)
+    print(f"✅ Wrote {output_path}")
+    print(f"   Scale: {scale}")
+    print(f"   Min: {min_}")
+
+def representative_windows(n: int = CHECK_SAMPLES, seed: int = 0) -> np.ndarray:
+    """
+    Sample normalized (1, 60, 4) training windows from data.csv.
+
+    Returns:
+        float32 array of shape (n, 1, 60, 4)
+    """
+    with open(DATA_PATH, newline='') as f:
+        header = next(csv.reader(f))
+    columns = [header.index(name) for name in FEATURE_COLUMNS]
+
+    # A few rows have gaps; the notebook drops them (df.dropna())
+    data = np.genfromtxt(DATA_PATH, delimiter=',', skip_header=1, usecols=columns, dtype=np.float32)
+    data = data[~np.isnan(data).any(axis=1)]
+
+    scale, min_ = scaler_affine()
+    scaled = (data * scale + min_).astype(np.float32)
+
+    starts = np.random.default_rng(seed).integers(0, len(scaled) - SEQUENCE_LENGTH, n)
+    return np.stack([scaled[None, s:s + SEQUENCE_LENGTH] for s in starts])
+
+def _frozen_concrete_function(model):
+    """Trace the model at a fixed (1, 60, 4) input and freeze its variables"""
+    @tf.function
+    def serve(x):
+        return model(x, training=False)
+
+    concrete = serve.get_concrete_function(
+        tf.TensorSpec([1, SEQUENCE_LENGTH, N_FEATURES], tf.float32)
+    )
+    return convert_variables_to_constants_v2(concrete)
+
+def _write(tflite_model: bytes, output_path: str):
+    with open(output_path, 'wb') as f:
+        f.write(tflite_model)
+    print(f"✅ Wrote {output_path} ({len(tflite_model) / 1024:.1f} KB)")
+
+def _max_error(tflite_model: bytes, model, windows: np.ndarray) -> float:
+    """Largest |TFLite - Keras| (normalized units) over the given windows"""
+    interpreter = tf.lite.Interpreter(model_content=tflite_model)
+    interpreter.allocate_tensors()
+    input_details = interpreter.get_input_details()[0]
+    output_details = interpreter.get_output_details()[0]
+
+    error = 0.0
+    for window in windows:
+        interpreter.set_tensor(input_details["index"], window)
+        interpreter.invoke()
+
+        y = interpreter.get_tensor(output_details["index"])
+        error = max(error, float(np.abs(y - model(window, training=False).numpy()).max()))
+    return error
+
+def export_tflite(model_path: str = MODEL_PATH, output_path: str = TFLITE_PATH) -> bytes:
+    """
+    Export the LSTM as a float32 TFLite flatbuffer.
+
+    The input is fixed at (1, 60, 4): the relu LSTM lowers to a while loop
+    whose tensor lists need static shapes, so the batch dimension can't
+    stay dynamic. Variables are frozen into constants before conversion.
+
+    Args:
+        model_path: Trained Keras model
+        output_path: Where to write the .tflite file
+
+    Returns:
+        The serialized flatbuffer
+    """
+    print(f"Loading model from {model_path}...")
+    model = keras.models.load_model(model_path)
+
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([_frozen_concrete_function(model)])
+    tflite_model = converter.convert()
+    _write(tflite_model, output_path)
+
+    # Sanity check: the interpreter must agree with Keras on a random window
+    sample = np.random.rand(1, 1, SEQUENCE_LENGTH, N_FEATURES).astype(np.float32)
+    print(f"   Max |TFLite - Keras|: {_max_error(tflite_model, model, sample):.2e}")
+
+    return tflite_model
+
+def export_tflite_int8(model_path: str = MODEL_PATH, output_path: str = TFLITE_INT8_PATH) -> bytes:
+    """
+    Export the LSTM with int8 weights (post-training dynamic range quantization).
+
+    The weight matrices are stored as int8 with per-channel scales, the
+    smallest of the exports (about half of boiler_model.tflite). The
+    interpreter dequantizes them per kernel call and activations, input
+    and output stay float32, so the server drives it like the float model.
+    Over a grid of in-range operating points a 30-step forecast stays
+    within 0.9°C of Keras (0.2°C on average) but runs ~10-20% slower than
+    the float model. Where Keras moves by well under a degree, the
+    direction of the int8 forecast can be wrong.
+
+    Full-integer quantization was measured and not adopted: the LSTM has
+    to be unrolled for it, which made the file ~6x larger than the float
+    export and slower, and its forecasts drifted up to ~4.5°C from Keras,
+    sometimes in the wrong direction. 16x8 quantization fixes most of the
+    drift but runs ~3x slower than the float model.
+
+    Args:
+        model_path: Trained Keras model
+        output_path: Where to write the .tflite file
+
+    Returns:
+        The serialized flatbuffer
+    """
+    print(f"Loading model from {model_path}...")
+    model = keras.models.load_model(model_path)
+
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([_frozen_concrete_function(model)])
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    tflite_model = converter.convert()
+    _write(tflite_model, output_path)
+
+    print(f"   Max |int8 - Keras| on training windows: {_max_error(tflite_model, model, representative_windows()):.2e}")
+
+    return tflite_model
+
+def export_tflite_fp16(model_path: str = MODEL_PATH, output_path: str = TFLITE_FP16_PATH) -> bytes:
+    """
+    Export the LSTM with float16 weights.
+
+    Halves the model size and weight bandwidth with little accuracy loss.
+    Unlike the int8-weight model it runs on the TFLite GPU delegate, which
+    computes in fp16 natively; on CPU the weights are expanded back to
+    float32 when the interpreter loads them. Input and output stay float32.
+
+    Args:
+        model_path: Trained Keras model
+        output_path: Where to write the .tflite file
+
+    Returns:
+        The serialized flatbuffer
+    """
+    print(f"Loading model from {model_path}...")
+    model = keras.models.load_model(model_path)
+
+    converter = tf.lite.TFLiteConverter.from_concrete_functions([_frozen_concrete_function(model)])
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    converter.target_spec.supported_types = [tf.float16]
+    tflite_model = converter.convert()
+    _write(tflite_model, output_path)
+
+    print(f"   Max |fp16 - Keras| on training windows: {_max_error(tflite_model, model, representative_windows()):.2e}")
+
+    return tflite_model
+
+def lstm_weights(model) -> dict:
+    """
+    Pull the LSTM and Dense weights out of the trained model.
+
+    The hand-built runtimes (numpy, onnx) hard-code the trained
+    architecture (relu LSTM with sigmoid gates, then a linear Dense(1)),
+    so anything else is rejected rather than exported into a silently
+    wrong forecast.
+
+    Returns:
+        Dict of float32 arrays: kernel (4, 4 * units) and recurrent_kernel
+        (units, 4 * units) with gates i, f, c, o; bias (4 * units,);
+        dense_kernel (units,); dense_bias (scalar)
+    """
+    lstm = next(layer for layer in model.layers if isinstance(layer, keras.layers.LSTM))
+    dense = model.layers[-1]
+    if (lstm.activation is not keras.activations.relu
+            or lstm.recurrent_activation is not keras.activations.sigmoid
+            or not isinstance(dense, keras.layers.Dense)
+            or dense.units != 1
+            or dense.activation is not keras.activations.linear):
+        raise ValueError("Export expects LSTM(relu, sigmoid gates) -> Dense(1, linear)")
+
+    kernel, recurrent_kernel, bias = lstm.get_weights()
+    dense_kernel, dense_bias = dense.get_weights()
+    return {
+        "kernel": kernel.astype(np.float32),
+        "recurrent_kernel": recurrent_kernel.astype(np.float32),
+        "bias": bias.astype(np.float32),
+        "dense_kernel": dense_kernel[:, 0].astype(np.float32),
+        "dense_bias": np.float32(dense_bias[0]),
+    }
+
+def export_weights(model_path: str = MODEL_PATH, output_path: str = WEIGHTS_PATH):
+    """
+    Save the LSTM and Dense weights as plain NumPy arrays (see lstm_weights()).
+
+    Args:
+        model_path: Trained Keras model
+        output_path: Where to write the .npz file
+    """
+    print(f"Loading model from {model_path}...")
+    weights = lstm_weights(keras.models.load_model(model_path))
+    np.savez(output_path, **weights)
+    print(f"✅ Wrote {output_path} ({weights['recurrent_kernel'].shape[0]} units)")
+
+def export_onnx(model_path: str = MODEL_PATH, output_path: str = ONNX_PATH) -> bytes:
+    """
+    Export the LSTM as an ONNX graph for ONNX Runtime.
+
+    The graph is built directly from the weights around ONNX's own LSTM
+    op (which takes relu activations) instead of going through tf2onnx,
+    whose protobuf pin clashes with TensorFlow's. Its input is time-major,
+    (60, batch, 4), the op's native layout, so the server can feed
+    contiguous windows of any batch size.
+
+    Args:
+        model_path: Trained Keras model
+        output_path: Where to write the .onnx file
+
+    Returns:
+        The serialized model
+    """
+    import onnx
+    from onnx import TensorProto, helper, numpy_helper
+
+    print(f"Loading model from {model_path}...")
+    model = keras.models.load_model(model_path)
+    weights = lstm_weights(model)
+    units = weights["recurrent_kernel"].shape[0]
+
+    def iofc(w):
+        """Keras gate order (i, f, c, o) -> ONNX (i, o, f, c)"""
+        i, f, c, o = np.split(w, 4, axis=-1)
+        return np.concatenate([i, o, f, c], axis=-1)
+
+    initializers = [
+        numpy_helper.from_array(iofc(weights["kernel"]).T[None], "W"),
+        numpy_helper.from_array(iofc(weights["recurrent_kernel"]).T[None], "R"),
+        # Input bias, then a zero recurrent bias
+        numpy_helper.from_array(np.concatenate([iofc(weights["bias"]), np.zeros(4 * units, np.float32)])[None], "B"),
+        numpy_helper.from_array(weights["dense_kernel"][:, None], "dense_kernel"),
+        numpy_helper.from_array(weights["dense_bias"][None], "dense_bias"),
+        numpy_helper.from_array(np.array([0], dtype=np.int64), "direction_axis"),
+    ]
+    nodes = [
+        helper.make_node("LSTM", ["sequence", "W", "R", "B"], ["", "Y_h"],
+                         hidden_size=units, activations=["Sigmoid", "Relu", "Relu"]),
+        helper.make_node("Squeeze", ["Y_h", "direction_axis"], ["h"]),
+        helper.make_node("MatMul", ["h", "dense_kernel"], ["hw"]),
+        helper.make_node("Add", ["hw", "dense_bias"], ["temperature"]),
+    ]
+    graph = helper.make_graph(
+        nodes, "boiler_lstm",
+        [helper.make_tensor_value_info("sequence", TensorProto.FLOAT, [SEQUENCE_LENGTH, "batch", N_FEATURES])],
+        [helper.make_tensor_value_info("temperature", TensorProto.FLOAT, ["batch", 1])],
+        initializers
+    )
+    # IR version 8 (opset 17) loads in ONNX Runtime releases back to 1.14
+    onnx_model = helper.make_model(graph, opset_imports=[helper.make_opsetid("", 17)], ir_version=8)
+    onnx.checker.check_model(onnx_model)
+
+    serialized = onnx_model.SerializeToString()
+    _write(serialized, output_path)
+
+    try:
+        import onnxruntime as ort
+    except ImportError:
+        print("   onnxruntime not installed; skipping the accuracy check")
+        return serialized
+
+    session = ort.InferenceSession(serialized, providers=["CPUExecutionProvider"])
+    sample = np.random.rand(8, SEQUENCE_LENGTH, N_FEATURES).astype(np.float32)
+    onnx_out = session.run(None, {"sequence": np.ascontiguousarray(sample.transpose(1, 0, 2))})[0]
+    print(f"   Max |ONNX - Keras|: {np.abs(onnx_out - model(sample, training=False).numpy()).max():.2e}")
+
+    return serialized
+
+def _forecast_concrete_function(model, steps: int = FORECAST_STEPS):
+    """
+    Freeze the full iterative forecast for one (1, 60, 4) window.
+
+    Same loop as main.py's build_forecast_graph(): each step appends
+    [controls, prediction] to the history and slides the window by one.
+    Takes a float32 (1, 60, 4) sequence and (1, 3) controls and returns
+    the (1, steps) normalized temperatures.
+    """
+    @tf.function
+    def forecast(sequence, controls):
+        history = tf.concat([sequence, tf.zeros([1, steps, N_FEATURES])], axis=1)
+
+        def body(i, history):
+            window = tf.slice(history, [0, i, 0], [-1, SEQUENCE_LENGTH, N_FEATURES])
+            pred = model(window, training=False)
+            next_row = tf.concat([controls, pred], axis=1)
+            history = tf.tensor_scatter_nd_update(history, [[0, SEQUENCE_LENGTH + i]], next_row)
+            return i + 1, history
+
+        _, history = tf.while_loop(lambda i, history: i < steps, body, [tf.constant(0), history])
+        return {"temperatures": history[:, SEQUENCE_LENGTH:, 3]}
+
+    concrete = forecast.get_concrete_function(
+        tf.TensorSpec([1, SEQUENCE_LENGTH, N_FEATURES], tf.float32, name="sequence"),
+        tf.TensorSpec([1, N_FEATURES - 1], tf.float32, name="controls")
+    )
+    # Keep the functional while loop: XLA can't compile the lowered
+    # (Enter/Exit) control flow
+    return convert_variables_to_constants_v2(concrete, lower_control_flow=False)
+
+def export_aot(model_path: str = MODEL_PATH, output_path: str = AOT_LIBRARY_PATH,
+               target_cpu: str = AOT_TARGET_CPU):
+    """
+    Compile the whole 30-step forecast ahead of time into a shared library.
+
+    The frozen forecast is saved as a SavedModel and compiled by
+    saved_model_cli aot_compile_cpu (tfcompile) into native code for the
+    fixed (1, 60, 4) shape. It is linked with the XLA AOT runtime shipped in
+    the tensorflow wheel and with boiler_forecast_aot.cc, which main.py
+    loads through ctypes. At runtime only libtensorflow_framework is loaded
+    (for Abseil), never the TensorFlow Python package.
+
+    Building the runtime from source takes a few minutes. The library is
+    specific to the platform and CPU family it was built for, so build it
+    on the deployment host rather than committing it.
+
+    Args:
+        model_path: Trained Keras model
+        output_path: Where to write the .so
+        target_cpu: LLVM CPU to generate code for
+    """
+    print(f"Loading model from {model_path}...")
+    model = keras.models.load_model(model_path)
+    frozen = _forecast_concrete_function(model)
+
+    tf_dir = os.path.dirname(tf.__file__)
+    wrapper_path = os.path.abspath(AOT_WRAPPER_PATH)
+    output_path = os.path.abspath(output_path)
+
+    with tempfile.TemporaryDirectory() as build_dir:
+        saved_model_dir = os.path.join(build_dir, "saved_model")
+        module = tf.Module()
+        module.forecast = frozen
+        tf.saved_model.save(module, saved_model_dir, signatures={"serving_default": frozen})
+
+        print(f"Compiling forecast for target CPU {target_cpu or 'generic x86-64'}...")
+        prefix = os.path.join(build_dir, "boiler_forecast")
+        subprocess.run([
+            "saved_model_cli", "aot_compile_cpu",
+            "--dir", saved_model_dir,
+            "--tag_set", "serve",
+            "--signature_def_key", "serving_default",
+            "--output_prefix", prefix,
+            "--cpp_class", "BoilerForecast",
+            "--target_cpu", target_cpu,
+        ], check=True)
+
+        print("Building the XLA AOT runtime (takes a few minutes)...")
+        runtime_dir = os.path.join(build_dir, "runtime")
+        subprocess.run([
+            "cmake", "-S", os.path.join(tf_dir, "xla_aot_runtime_src"), "-B", runtime_dir,
+            "-DCMAKE_BUILD_TYPE=Release", "-DCMAKE_POSITION_INDEPENDENT_CODE=ON", "-DCMAKE_CXX_FLAGS=-w",
+        ], check=True, stdout=subprocess.DEVNULL)
+        subprocess.run(["make", "-C", runtime_dir, f"-j{os.cpu_count() or 1}"], check=True, stdout=subprocess.DEVNULL)
+
+        print("Linking...")
+        subprocess.run([
+            "g++", "-O2", "-fPIC", "-shared", "-std=c++17", "-w", "-D_GLIBCXX_USE_CXX11_ABI=1",
+            f"-I{os.path.join(tf_dir, 'include')}", f"-I{build_dir}",
+            wrapper_path,
+            f"{prefix}.o", f"{prefix}_constants.o", f"{prefix}_metadata.o",
+            os.path.join(runtime_dir, "libtf_xla_runtime.a"),
+            # Abseil comes from the framework library already in the wheel
+            f"-L{tf_dir}", "-l:libtensorflow_framework.so.2", f"-Wl,-rpath,{tf_dir}",
+            "-lpthread", "-o", output_path,
+        ], check=True)
+
+    print(f"✅ Wrote {output_path} ({os.path.getsize(output_path) / 1024:.1f} KB)")
+
+    # Sanity check: the library must agree with the frozen graph
+    import ctypes
+    library = ctypes.CDLL(output_path)
+    array = np.ctypeslib.ndpointer(np.float32, flags="C_CONTIGUOUS")
+    library.boiler_forecast.argtypes = [array, array, array]
+    sequence = np.random.rand(1, SEQUENCE_LENGTH, N_FEATURES).astype(np.float32)
+    controls = np.ascontiguousarray(sequence[:, -1, :3])
+    temperatures = np.empty((1, FORECAST_STEPS), dtype=np.float32)
+    if library.boiler_forecast(sequence, controls, temperatures) != 0:
+        raise RuntimeError("AOT forecast failed")
+    expected = frozen(tf.constant(sequence), tf.constant(controls))[0].numpy()
+    print(f"   Max |AOT - graph|: {np.abs(temperatures - expected).max():.2e}")
+
+EXPORTERS = {
+    "scaler": export_scaler,
+    "tflite": export_tflite,
+    "int8": export_tflite_int8,
+    "fp16": export_tflite_fp16,
+    "numpy": export_weights,
+    "onnx": export_onnx,
+    "aot": export_aot,
+}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export boiler_model.keras for the compiled inference runtimes")
+    parser.add_argument("formats", nargs="*", help=f"Formats to export: {', '.join(EXPORTERS)} (default: all)")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.formats if name not in EXPORTERS]
+    if unknown:
+        parser.error(f"unknown format(s): {', '.join(unknown)}")
+
+    print("="*60)
+    print("MODEL EXPORT")
+    print("="*60)
+
+    for name in args.formats or EXPORTERS:
+        print(f"\n[{name}]")
+        EXPORTERS[name]()
+
+    print("\n✅ Done! Select a runtime when starting the server, e.g.:")
+    print("   INFERENCE_RUNTIME=tflite python main.py")